@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+cli.py
+~~~~~~
+
+Non-interactive command line for processing one or more Mods folders
+(profiles) without the loading bar or the sign-in prompt of main.py.
+
+    python cli.py manifest Mods
+    python cli.py load     Mods profiles/*/Mods --json
+    python cli.py validate profiles/*/Mods --jobs 16
+    python cli.py resolve  Mods --strict --conflicts-as-errors
+    python cli.py export   profiles/*/Mods -o export.json
+
+Profiles are processed concurrently.  A mod file that appears in several
+profiles (same path, or a copy with identical contents) is parsed only once.
+
+Exit codes: 0 – everything OK, 1 – at least one profile had errors,
+2 – bad command line usage, 3 – internal failure (a bug, not a bad mod).
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from rich import print
+from rich.markup import escape
+
+import dependencies
+from modschema import find_mod_files, read_error, validate_bytes
+from overlay import OverlayEngine
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERNAL = 3
+
+COMMANDS = ("manifest", "load", "validate", "resolve", "export")
+
+
+# --------------------------------------------------------------------------- #
+#  Shared parse cache
+# --------------------------------------------------------------------------- #
+
+class ParseCache:
+    """
+    Thread-safe cache of parsed mod files.
+
+    Files are looked up by (real path, mtime, size) first and by a hash of
+    their contents second, so symlinked *and* copied files are parsed once.
+    Cached mod dicts are shared between profiles – treat them as read-only.
+    With *strict*, files with schema errors are rejected without building
+    their mod dict.
+    """
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._by_stat: Dict[Tuple, concurrent.futures.Future] = {}
+        self._by_digest: Dict[str, concurrent.futures.Future] = {}
+        self.hits = 0       # files served from the cache
+        self.misses = 0     # files actually parsed
+
+    def get(self, path: pathlib.Path) -> Dict:
+        """Return ``{"mod", "error", "diagnostics"}`` for *path* (see modschema)."""
+        try:
+            st = path.stat()
+        except OSError as exc:
+            return _entry(read_error(exc, path.name))
+        stat_key = (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+        fut, owner = self._claim(self._by_stat, stat_key)
+        if not owner:
+            self._count("hits")
+            return fut.result()
+
+        inner, inner_owner = None, False
+        try:
+            try:
+                data = path.read_bytes()
+            except OSError as exc:
+                result = _entry(read_error(exc, path.name))
+            else:
+                digest = hashlib.sha1(data).hexdigest()
+                inner, inner_owner = self._claim(self._by_digest, digest)
+                if inner_owner:
+                    self._count("misses")
+                    inner.set_result(_parse_bytes(data, path.name, self.strict))
+                else:
+                    self._count("hits")
+                result = inner.result()
+        except Exception as exc:  # keep other threads from waiting forever
+            if inner_owner and not inner.done():
+                inner.set_exception(exc)
+            fut.set_exception(exc)
+            raise
+        fut.set_result(result)
+        return result
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def _claim(self, table: Dict, key) -> Tuple[concurrent.futures.Future, bool]:
+        """Return the future for *key* and whether the caller must fill it."""
+        with self._lock:
+            fut = table.get(key)
+            if fut is not None:
+                return fut, False
+            fut = table[key] = concurrent.futures.Future()
+            return fut, True
+
+
+def _parse_bytes(data: bytes, filename: str, strict: bool = False) -> Dict:
+    return _entry(validate_bytes(data, filename, strict=strict))
+
+
+def _entry(res: Dict) -> Dict:
+    """Cache entry for a modschema result; *error* is set if the file is unusable."""
+    error = None
+    if res["mod"] is None and not res["rejected"]:
+        error = res["diagnostics"][0]["message"]
+    return {"mod": res["mod"], "error": error, "rejected": res["rejected"],
+            "diagnostics": res["diagnostics"]}
+
+
+# --------------------------------------------------------------------------- #
+#  Per-profile work
+# --------------------------------------------------------------------------- #
+
+def _load(folder: pathlib.Path, cache: ParseCache) -> List[Dict]:
+    """Parse every mod file in *folder*; one entry per file."""
+    entries = []
+    for xml_file in find_mod_files(folder):
+        parsed = cache.get(xml_file)
+        entries.append({
+            "file": xml_file.relative_to(folder).as_posix(),
+            "mod": parsed["mod"],
+            "error": parsed["error"],
+            "rejected": parsed["rejected"],
+            "diagnostics": parsed["diagnostics"],
+        })
+    return entries
+
+
+def _summary(mod: Dict) -> Dict:
+    return {k: mod.get(k) for k in ("modId", "name", "version", "author")}
+
+
+def _resolve(entries: List[Dict]) -> Dict:
+    overlay = OverlayEngine(e["mod"] for e in entries if e["mod"] is not None)
+    return {
+        "load_order": overlay.load_order,
+        "effective": overlay.effective,
+        "conflicts": overlay.conflicts,
+        "missing_dependencies": overlay.missing_dependencies,
+        "cycles": overlay.cycles,
+        "unresolved": overlay.unresolved,
+        "duplicates": {
+            mod_id: [e["file"] for e in entries if e["mod"] and e["mod"].get("modId") == mod_id]
+            for mod_id in overlay.duplicates
+        },
+    }
+
+
+def process_profile(command: str, folder: pathlib.Path, cache: ParseCache,
+                    args: argparse.Namespace) -> Dict:
+    """Run *command* on one Mods folder and return a JSON-ready result dict."""
+    result: Dict = {"profile": str(folder), "ok": True, "errors": []}
+
+    if not folder.is_dir():
+        result["ok"] = False
+        result["errors"].append(f"Mods folder {folder} does not exist")
+        return result
+
+    if command == "manifest":
+        try:
+            # Same selection as dependencies.loadmods: top-level regular files
+            files = [] if args.disable else sorted(dependencies.list_mod_files(str(folder)))
+            result["files"] = files
+            if not args.dry_run:
+                result["manifest"] = dependencies.write_manifest(str(folder), files)
+        except OSError as exc:
+            result["errors"].append(f"cannot write manifest: {exc}")
+        result["ok"] = not result["errors"]
+        return result
+
+    entries = _load(folder, cache)
+    for e in entries:
+        if e["error"]:
+            line = e["diagnostics"][0]["line"]
+            result["errors"].append(f"{e['file']}:{line}: {e['error']}")
+
+    for e in entries:
+        if e["rejected"] and command != "validate":
+            result["errors"].append(f"{e['file']}: rejected ({len(e['diagnostics'])} schema error(s))")
+
+    if command == "load":
+        result["mods"] = [dict(_summary(e["mod"]), file=e["file"]) for e in entries if e["mod"]]
+
+    elif command == "validate":
+        result["files"] = []
+        for e in entries:
+            result["files"].append({
+                "file": e["file"],
+                "valid": not e["diagnostics"],
+                "diagnostics": e["diagnostics"],
+            })
+            if not e["error"]:
+                result["errors"].extend(
+                    f"{e['file']}:{d['line']}: <{d['path']}> {d['message']}" for d in e["diagnostics"]
+                )
+
+    elif command in ("resolve", "export"):
+        result.update(_resolve(entries))
+        for mod_id, missing in result["missing_dependencies"].items():
+            result["errors"].append(f"{mod_id}: missing dependencies {', '.join(missing)}")
+        if result["cycles"]:
+            result["errors"].append(f"dependency cycle: {', '.join(result['cycles'])}")
+        for mod_id, files in result["duplicates"].items():
+            result["errors"].append(f"duplicate modId {mod_id} in {', '.join(files)} (using {files[0]})")
+        if result["unresolved"]:
+            result["errors"].append(f"blocked by a dependency cycle: {', '.join(result['unresolved'])}")
+        if args.conflicts_as_errors:
+            for c in result["conflicts"]:
+                result["errors"].append(f"conflict on {c['field']}: {', '.join(c['mods'])}")
+        if command == "export":
+            result["mods"] = [dict(e["mod"], file=e["file"]) for e in entries if e["mod"]]
+
+    result["ok"] = not result["errors"]
+    return result
+
+
+def _run_profile(command: str, folder: pathlib.Path, cache: ParseCache,
+                 args: argparse.Namespace) -> Dict:
+    """:func:`process_profile`, but a crash only fails this one profile."""
+    try:
+        return process_profile(command, folder, cache, args)
+    except Exception as exc:
+        logging.exception("Internal error while processing %s", folder)
+        return {
+            "profile": str(folder),
+            "ok": False,
+            "internal": True,
+            "errors": [f"internal error: {exc!r}"],
+        }
+
+
+# --------------------------------------------------------------------------- #
+#  Output
+# --------------------------------------------------------------------------- #
+
+def _print_human(command: str, result: Dict) -> None:
+    status = "[green]OK[/green]" if result["ok"] else "[red]FAILED[/red]"
+    print(f"{status} {command} {escape(result['profile'])}")
+
+    if command == "manifest":
+        print(f"  {len(result.get('files', []))} .xml file(s) listed")
+    elif command == "load":
+        for m in result.get("mods", []):
+            print(f"  • {escape(str(m['modId']))} – {escape(str(m['name']))} "
+                  f"(v{escape(str(m.get('version')))})")
+    elif command in ("resolve", "export"):
+        if result.get("load_order"):
+            print(f"  load order: {escape(' → '.join(result['load_order']))}")
+        for field, value in result.get("effective", {}).items():
+            print(f"  {field} = {value:g}")
+        for c in result.get("conflicts", []):
+            print(f"  [yellow]conflict on {c['field']}: {escape(', '.join(c['mods']))} "
+                  f"(using {escape(c['winner'])})[/yellow]")
+
+    for err in result["errors"]:
+        print(f"  [red]{escape(err)}[/red]")
+
+
+# --------------------------------------------------------------------------- #
+#  Entry point
+# --------------------------------------------------------------------------- #
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Headless BarkEngine mod processing.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in COMMANDS:
+        p = sub.add_parser(name)
+        p.add_argument("folders", nargs="+", type=pathlib.Path,
+                       help="one or more Mods folders (profiles)")
+        p.add_argument("--json", action="store_true",
+                       help="print a single JSON document instead of text")
+        p.add_argument("-j", "--jobs", type=int, default=min(32, (os.cpu_count() or 1) + 4),
+                       help="number of profiles processed at once")
+        p.add_argument("-q", "--quiet", action="store_true",
+                       help="only log errors to stderr")
+        if name == "manifest":
+            p.add_argument("--disable", action="store_true",
+                           help="write an empty manifest (mod loading disabled)")
+            p.add_argument("--dry-run", action="store_true",
+                           help="list the files but do not write Manifest.yaml")
+        if name in ("load", "resolve", "export"):
+            p.add_argument("--strict", action="store_true",
+                           help="reject mods that fail the schema (see modschema.py)")
+        if name in ("resolve", "export"):
+            p.add_argument("--conflicts-as-errors", action="store_true",
+                           help="treat conflicting values as errors")
+        if name == "export":
+            p.add_argument("-o", "--output", type=pathlib.Path,
+                           help="write the JSON export to this file instead of stdout")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.quiet:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    # validate only needs diagnostics; --strict drops invalid mods anyway
+    strict = args.command == "validate" or getattr(args, "strict", False)
+    cache = ParseCache(strict=strict)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(
+            lambda folder: _run_profile(args.command, folder, cache, args),
+            args.folders,
+        ))
+
+    ok = all(r["ok"] for r in results)
+    internal = any(r.get("internal") for r in results)
+    document = {
+        "command": args.command,
+        "ok": ok,
+        "profiles": results,
+        "cache": {"hits": cache.hits, "misses": cache.misses},
+    }
+
+    if args.command == "export" and args.output:
+        try:
+            args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        except OSError as exc:
+            logging.error("Cannot write export to %s: %s", args.output, exc)
+            ok = document["ok"] = False
+    if args.json or (args.command == "export" and not args.output):
+        sys.stdout.write(json.dumps(document, indent=2) + "\n")
+    else:
+        for r in results:
+            _print_human(args.command, r)
+
+    if internal:
+        return EXIT_INTERNAL
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception:
+        logging.exception("Internal error")
+        sys.exit(EXIT_INTERNAL)
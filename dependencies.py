@@ -20,6 +20,33 @@ import time
 import os
 import time
 
+def list_mod_files(mods_path: str) -> list[str]:
+    """
+    Names of the regular .xml files directly inside *mods_path* – the files
+    the manifest lists.
+    """
+    return [
+        name for name in os.listdir(mods_path)
+        if name.lower().endswith(".xml") and
+           os.path.isfile(os.path.join(mods_path, name))
+    ]
+
+
+def write_manifest(mods_path: str, xml_files: list[str]) -> str:
+    """
+    Write *xml_files* into ``<mods_path>/Manifest.yaml`` and return its path.
+
+    No messages and no delay – this is the part of :func:`loadmods` that
+    scripts (see cli.py) can call directly.
+    """
+    manifest_path = os.path.join(mods_path, "Manifest.yaml")
+    with open(manifest_path, "w", encoding="utf-8") as out:
+        out.write("files:\n")
+        for fname in xml_files:
+            out.write(f"  - {fname}\n")
+    return manifest_path
+
+
 def loadmods(action: str | None = None) -> None:
     """
     Write the list of .xml files into Mods/Manifest.yaml.
@@ -50,18 +77,10 @@ def loadmods(action: str | None = None) -> None:
         xml_files = []                     # nothing to list
     else:
         disablemodload = 0
-        xml_files = [
-            name for name in os.listdir(mods_path)
-            if name.lower().endswith(".xml") and
-               os.path.isfile(os.path.join(mods_path, name))
-        ]
+        xml_files = list_mod_files(mods_path)
 
     # 3️⃣  Write the manifest (always overwriting the old file)
-    manifest_path = os.path.join(mods_path, "Manifest.yaml")
-    with open(manifest_path, "w", encoding="utf-8") as out:
-        out.write("files:\n")
-        for fname in xml_files:
-            out.write(f"  - {fname}\n")
+    write_manifest(mods_path, xml_files)
 
     # Optional – give the user a quick summary
     print("[red]Loading Mods...[red]")
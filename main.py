@@ -1,6 +1,7 @@
 import dependencies
 import os
 from modstuff import load_mods_from_folder
+from overlay import OverlayEngine
 from rich import print
 import subprocess
 
@@ -39,14 +40,22 @@ def loading_bar(total_steps, bar_length=50, prefix='Loading: ', suffix='Done', d
 
 
 
-def registermods() -> None:
-    mods = load_mods_from_folder()      # <-- the helper above
+def registermods() -> OverlayEngine:
+    # strictmodload rejects mods that fail the schema in modschema.py
+    mods = load_mods_from_folder(strict=bool(dependencies.CONFIG.get("strictmodload")))
 
     # Example: register every valid mod with your engine‑API
     for mod in mods:
         # your custom logic – e.g. add to a registry, instantiate objects, etc.
         print(f"[green]Registering {mod['modId']} – {mod['name']}[/green]")
 
+    # Show which engine/vehicle values clash between the active mods
+    overlay = OverlayEngine(mods)
+    for conflict in overlay.conflicts:
+        print(f"[yellow]Conflict on {conflict['field']}: {', '.join(conflict['mods'])} "
+              f"(using {conflict['winner']})[/yellow]")
+    return overlay
+
 print(" ")
 registermods()
 print(" ")
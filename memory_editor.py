@@ -198,3 +198,196 @@ class MemoryEditor:
         """
         addr = self.resolve_pointer(name)
         self.write_bytes(addr, struct.pack(fmt, value))
+
+    # ----------------------------------------------------------------
+    # Batched writes
+    # ----------------------------------------------------------------
+    def transaction(self, merge_gap: int = 0) -> 'WriteTransaction':
+        """
+        Start a batch of writes that is applied (or undone) as a whole.
+
+        >>> with mem.transaction() as tx:
+        ...     tx.set_value('health', 999)
+        ...     tx.set_value('speed', 9999.99, fmt='f')
+        """
+        return WriteTransaction(self, merge_gap=merge_gap)
+
+
+# ────────────────────────────────────────────────────────────────
+# Write transactions
+# ────────────────────────────────────────────────────────────────
+class WriteTransaction:
+    """
+    Stages writes and applies them in as few WriteProcessMemory calls as
+    possible.
+
+    * The original bytes are read right before writing (one ReadProcessMemory
+      over the whole staged span when it is small enough).
+    * Bytes that already hold the staged value are not written.
+    * Adjacent changed bytes are written in a single call; with `merge_gap`
+      gaps of up to that many unchanged bytes are bridged using the
+      snapshot.  Those gap bytes are written back as read a moment earlier,
+      so only bridge gaps the game does not update on its own.
+    * If a write fails, everything already written is restored and the
+      error is re-raised.  `rollback()` also undoes a committed transaction.
+
+    Used as a context manager it commits on success and rolls back on error.
+    """
+
+    # Largest span (bytes) snapshotted with a single read
+    MAX_SNAPSHOT_SPAN = 64 * 1024
+
+    def __init__(self, editor: MemoryEditor, merge_gap: int = 0):
+        self.editor = editor
+        self.merge_gap = merge_gap
+        self.state = 'open'          # open → committed / rolled_back
+        self._staged = {}            # address → byte value (later writes win)
+        self._original = {}          # address → byte value before commit
+        self._written = []           # (address, data) ranges already applied
+        self.writes_issued = 0       # WriteProcessMemory calls made by commit()
+
+    # ----------------------------------------------------------------
+    def write(self, address: int, data: bytes):
+        """Stage raw bytes at `address`."""
+        if self.state != 'open':
+            raise RuntimeError(f"Transaction is already {self.state}")
+        for i, b in enumerate(data):
+            self._staged[address + i] = b
+
+    def set_value(self, name: str, value, fmt: str = 'i') -> int:
+        """Resolve the pointer named `name`, stage a value for it and return the address."""
+        address = self.editor.resolve_pointer(name)
+        self.write(address, struct.pack(fmt, value))
+        return address
+
+    def write_int(self, address: int, value: int):
+        self.write(address, struct.pack('<i', value))
+
+    def write_float(self, address: int, value: float):
+        self.write(address, struct.pack('<f', value))
+
+    # ----------------------------------------------------------------
+    def snapshot(self):
+        """Read the original bytes of every staged address not read yet."""
+        missing = sorted(a for a in self._staged if a not in self._original)
+        if not missing:
+            return
+
+        start, end = missing[0], missing[-1] + 1
+        if end - start <= self.MAX_SNAPSHOT_SPAN:
+            try:
+                self._store_original(start, self.editor.read_bytes(start, end - start))
+                return
+            except OSError:
+                pass  # the span crosses unreadable memory – fall back to per-range reads
+
+        for addr, length in self._runs(missing):
+            self._store_original(addr, self.editor.read_bytes(addr, length))
+
+    def diff(self):
+        """
+        Return ``[(address, old_bytes, new_bytes), ...]`` for every range the
+        commit would write.
+
+        This is a preview based on the bytes read at the time; `commit()`
+        reads them again right before writing.
+        """
+        self.snapshot()
+        changed = sorted(a for a, b in self._staged.items() if self._original[a] != b)
+
+        # Bridge small gaps, but only where the snapshot knows the bytes in between
+        runs = []
+        for addr, length in self._runs(changed):
+            if runs:
+                prev_addr, prev_len = runs[-1]
+                gap = range(prev_addr + prev_len, addr)
+                if len(gap) <= self.merge_gap and all(a in self._original for a in gap):
+                    runs[-1] = (prev_addr, addr + length - prev_addr)
+                    continue
+            runs.append((addr, length))
+
+        result = []
+        for addr, length in runs:
+            span = range(addr, addr + length)
+            old = bytes(self._original[a] for a in span)
+            new = bytes(self._staged.get(a, self._original[a]) for a in span)
+            result.append((addr, old, new))
+        return result
+
+    def commit(self) -> int:
+        """Apply all staged writes; returns the number of writes issued."""
+        if self.state != 'open':
+            raise RuntimeError(f"Transaction is already {self.state}")
+        # The game may have changed values since diff() was called – re-read
+        # so equal-byte skipping, gap bridging and rollback use current bytes
+        self._original.clear()
+        for addr, old, new in self.diff():
+            try:
+                self.editor.write_bytes(addr, new)
+            except OSError as exc:
+                try:
+                    self._restore()
+                except OSError as rollback_exc:
+                    raise rollback_exc from exc
+                finally:
+                    self.state = 'rolled_back'
+                raise
+            self._written.append((addr, old))
+        self.state = 'committed'
+        self.writes_issued = len(self._written)
+        return self.writes_issued
+
+    def original_bytes(self, address: int, size: int) -> bytes:
+        """Bytes at `address` as read by the last snapshot (before any write)."""
+        self.snapshot()
+        return bytes(self._original[a] for a in range(address, address + size))
+
+    def rollback(self):
+        """Discard staged writes, or restore the originals if already committed."""
+        try:
+            if self.state == 'committed':
+                self._restore()
+        finally:
+            self._staged.clear()
+            self.state = 'rolled_back'
+
+    # ----------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.state != 'open':
+            return False
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    # ----------------------------------------------------------------
+    def _store_original(self, address: int, data: bytes):
+        for i, b in enumerate(data):
+            self._original[address + i] = b
+
+    def _restore(self):
+        """Write back the original bytes of every applied range, newest first."""
+        errors = []
+        for addr, old in reversed(self._written):
+            try:
+                self.editor.write_bytes(addr, old)
+            except OSError as exc:
+                errors.append(exc)
+        self._written.clear()
+        if errors:
+            raise OSError(f"Rollback incomplete, {len(errors)} range(s) could not be restored: {errors[0]}")
+
+    @staticmethod
+    def _runs(addresses):
+        """Group sorted addresses into (start, length) runs of adjacent bytes."""
+        runs = []
+        for a in addresses:
+            if runs and a == runs[-1][0] + runs[-1][1]:
+                runs[-1][1] += 1
+            else:
+                runs.append([a, 1])
+        return [(start, length) for start, length in runs]
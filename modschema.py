@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+modschema.py
+~~~~~~~~~~~~
+
+Declarative schema for mod XML files and a validator that checks a file
+against it in one pass, reporting *every* problem with its line number
+instead of logging and carrying on.
+
+>>> from modschema import validate_folder
+>>> for res in validate_folder(pathlib.Path("Mods")):
+...     for d in res["diagnostics"]:
+...         print(f"{res['file']}:{d['line']}: {d['path']}: {d['message']}")
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import math
+import pathlib
+import re
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.parsers import expat
+
+from modstuff import MODS_DIR, _parse_mod_tree
+
+# --------------------------------------------------------------------------- #
+#  Schema
+# --------------------------------------------------------------------------- #
+
+# path (relative to <mod>) -> rule.  Rule keys:
+#   required – tag must be present and non-empty
+#   type     – str, identifier, int, float, bool, enum, semver, section
+#   min/max  – numeric range (inclusive)
+#   values   – allowed values for "enum"
+#   attrs    – {attribute: rule} checked on every matching element
+MOD_SCHEMA: Dict[str, Dict] = {
+    "modInfo": {"type": "section", "required": True},
+    "modInfo/modId": {"type": "identifier", "required": True},
+    "modInfo/name": {"type": "str", "required": True},
+    "modInfo/author": {"type": "str"},
+    "modInfo/version": {"type": "semver"},
+    "modInfo/modPage": {"type": "str"},
+
+    "compatibility/minEngine": {"type": "semver"},
+    "compatibility/maxEngine": {"type": "semver"},
+    "compatibility/dependencies/dependency": {"type": "identifier"},
+
+    "engine": {"type": "section", "required": True},
+    "engine/hp": {"type": "int", "required": True, "min": 1, "max": 5000},
+    "engine/torque": {"type": "int", "min": 0, "max": 10000},
+    "engine/weight": {"type": "float", "min": 0, "max": 5000},
+    "engine/fuelType": {"type": "enum", "values": ("gasoline", "diesel", "electric", "hybrid")},
+    "engine/fuelEfficiency": {"type": "float", "min": 0, "max": 100},
+    "engine/turbo": {"type": "bool"},
+    "engine/turboBoost": {"type": "float", "min": 0, "max": 10},
+    "engine/powerCurve/point": {
+        "type": "section",
+        "attrs": {
+            "rpm": {"type": "int", "required": True, "min": 0, "max": 30000},
+            "multiplier": {"type": "float", "required": True, "min": 0, "max": 10},
+        },
+    },
+
+    "vehicle/weightMultiplier": {"type": "float", "min": 0.01, "max": 100},
+    "vehicle/soundPitch": {"type": "float", "min": 0.01, "max": 100},
+}
+
+_SEMVER = re.compile(r"^\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?$")
+_IDENTIFIER = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+_BOOLS = {"yes", "no", "true", "false", "1", "0", "on", "off"}
+
+
+# --------------------------------------------------------------------------- #
+#  Parsing with line numbers
+# --------------------------------------------------------------------------- #
+
+def parse_with_lines(data: bytes) -> Tuple[ET.Element, Dict[ET.Element, int]]:
+    """
+    Parse *data* into an ElementTree and return ``(root, lines)`` where
+    *lines* maps every element to the line its start tag is on.
+
+    Raises :class:`xml.parsers.expat.ExpatError` on malformed XML.
+    """
+    builder = ET.TreeBuilder()
+    lines: Dict[ET.Element, int] = {}
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+
+    def start(tag, attrs):
+        lines[builder.start(tag, attrs)] = parser.CurrentLineNumber
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = builder.end
+    parser.CharacterDataHandler = builder.data
+    parser.Parse(data, True)
+    return builder.close(), lines
+
+
+# --------------------------------------------------------------------------- #
+#  Compilation
+# --------------------------------------------------------------------------- #
+
+# A compiled check takes the text of a tag/attribute and returns an error
+# message, or None if the value is fine.
+_Check = Callable[[str], Optional[str]]
+
+
+def _compile_value(rule: Dict) -> _Check:
+    kind = rule.get("type", "str")
+    lo, hi = rule.get("min"), rule.get("max")
+
+    def _range(value: float) -> Optional[str]:
+        if lo is not None and value < lo:
+            return f"{value:g} is below the minimum of {lo:g}"
+        if hi is not None and value > hi:
+            return f"{value:g} is above the maximum of {hi:g}"
+        return None
+
+    if kind == "int":
+        def check(txt: str) -> Optional[str]:
+            try:
+                value = int(txt)
+            except ValueError:
+                return f"expected an integer, got {txt!r}"
+            return _range(value)
+    elif kind == "float":
+        def check(txt: str) -> Optional[str]:
+            try:
+                value = float(txt)
+            except ValueError:
+                return f"expected a number, got {txt!r}"
+            if not math.isfinite(value):
+                return f"expected a finite number, got {txt!r}"
+            return _range(value)
+    elif kind == "bool":
+        def check(txt: str) -> Optional[str]:
+            if txt.lower() not in _BOOLS:
+                return f"expected yes/no, got {txt!r}"
+            return None
+    elif kind == "enum":
+        allowed = frozenset(rule["values"])
+        expected = ", ".join(rule["values"])
+
+        def check(txt: str) -> Optional[str]:
+            if txt not in allowed:
+                return f"expected one of {expected}, got {txt!r}"
+            return None
+    elif kind in ("semver", "identifier"):
+        pattern = _SEMVER if kind == "semver" else _IDENTIFIER
+        label = "a semantic version (e.g. 1.2.0)" if kind == "semver" else "an identifier (no spaces)"
+
+        def check(txt: str) -> Optional[str]:
+            if not pattern.match(txt):
+                return f"expected {label}, got {txt!r}"
+            return None
+    elif kind in ("str", "section"):
+        def check(txt: str) -> Optional[str]:
+            return None
+    else:
+        raise ValueError(f"Unknown schema type {kind!r}")
+    return check
+
+
+class SchemaValidator:
+    """
+    A schema compiled into per-path check functions.
+
+    Compile once and reuse it for every file – :data:`MOD_VALIDATOR` is the
+    compiled :data:`MOD_SCHEMA`.
+    """
+
+    def __init__(self, schema: Dict[str, Dict]):
+        self.schema = schema
+        # (path, parent path, required, is_section, value check, attribute checks)
+        self._rules: List[Tuple] = []
+        for path, rule in schema.items():
+            parent = path.rpartition("/")[0]
+            attrs = [
+                (name, bool(a.get("required")), _compile_value(a))
+                for name, a in rule.get("attrs", {}).items()
+            ]
+            self._rules.append((
+                path,
+                parent,
+                bool(rule.get("required")),
+                rule.get("type") == "section",
+                _compile_value(rule),
+                attrs,
+            ))
+
+    def validate(self, root: ET.Element, lines: Dict[ET.Element, int]) -> List[Dict]:
+        """Check a parsed <mod> tree; returns every diagnostic found."""
+        diagnostics: List[Dict] = []
+
+        def report(elem: ET.Element, path: str, message: str) -> None:
+            diagnostics.append({"line": lines.get(elem, 0), "path": path, "message": message})
+
+        if root.tag != "mod":
+            report(root, root.tag, "root element must be <mod>")
+            return diagnostics
+
+        for path, parent, required, is_section, check, attrs in self._rules:
+            elems = root.findall(path)
+            if not elems:
+                if required:
+                    anchor = root.find(parent) if parent else root
+                    # A missing parent is reported by its own rule
+                    if anchor is not None:
+                        report(anchor, path, "required tag is missing")
+                continue
+
+            for elem in elems:
+                if not is_section:
+                    txt = (elem.text or "").strip()
+                    if not txt:
+                        if required:
+                            report(elem, path, "required tag is empty")
+                    else:
+                        msg = check(txt)
+                        if msg:
+                            report(elem, path, msg)
+
+                for name, attr_required, attr_check in attrs:
+                    value = elem.get(name)
+                    if value is None:
+                        if attr_required:
+                            report(elem, f"{path}@{name}", "required attribute is missing")
+                        continue
+                    msg = attr_check(value.strip())
+                    if msg:
+                        report(elem, f"{path}@{name}", msg)
+
+        diagnostics.sort(key=lambda d: d["line"])
+        return diagnostics
+
+
+MOD_VALIDATOR = SchemaValidator(MOD_SCHEMA)
+
+
+# --------------------------------------------------------------------------- #
+#  Validating files and folders
+# --------------------------------------------------------------------------- #
+
+def validate_bytes(data: bytes, filename: str,
+                   validator: SchemaValidator = MOD_VALIDATOR, *,
+                   strict: bool = False) -> Dict:
+    """
+    Validate the contents of one mod file.
+
+    Returns ``{"file", "valid", "rejected", "diagnostics", "mod"}`` where
+    *mod* is the parsed mod dict (as from modstuff) or None if the XML is
+    unusable.  With *strict*, a file with schema errors is ``rejected`` and
+    its mod dict is never built (so modstuff does not log the same problems
+    a second time).
+    """
+    try:
+        root, lines = parse_with_lines(data)
+    except expat.ExpatError as exc:
+        return {
+            "file": filename,
+            "valid": False,
+            "rejected": False,
+            "diagnostics": [{"line": exc.lineno, "path": "xml", "message": f"XML parse error: {exc}"}],
+            "mod": None,
+        }
+
+    diagnostics = validator.validate(root, lines)
+    rejected = strict and root.tag == "mod" and bool(diagnostics)
+    return {
+        "file": filename,
+        "valid": not diagnostics,
+        "rejected": rejected,
+        "diagnostics": diagnostics,
+        "mod": _parse_mod_tree(root, filename) if root.tag == "mod" and not rejected else None,
+    }
+
+
+def read_error(exc: OSError, filename: str) -> Dict:
+    """Result (shaped like :func:`validate_bytes`) for a file that can't be read."""
+    message = f"cannot read file: {exc.strerror or exc}"
+    return {
+        "file": filename,
+        "valid": False,
+        "rejected": False,
+        "diagnostics": [{"line": 0, "path": "file", "message": message}],
+        "mod": None,
+    }
+
+
+def find_mod_files(folder: pathlib.Path) -> List[pathlib.Path]:
+    """
+    Every *.xml entry below *folder* that should be checked: regular files,
+    plus broken symlinks so they are reported instead of silently dropped.
+    Directories that happen to end in .xml are skipped.
+    """
+    return sorted(p for p in folder.rglob("*.xml")
+                  if p.is_file() or (p.is_symlink() and not p.exists()))
+
+
+def validate_file(path: pathlib.Path, validator: SchemaValidator = MOD_VALIDATOR, *,
+                  strict: bool = False) -> Dict:
+    """
+    Validate a single mod file on disk; see :func:`validate_bytes`.
+
+    A file that cannot be read gets a single diagnostic instead of raising.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError as exc:
+        return read_error(exc, path.name)
+    return validate_bytes(data, path.name, validator, strict=strict)
+
+
+# Compiled validator of a worker process, set once by _init_worker
+_worker_validator: Optional[SchemaValidator] = None
+
+
+def _init_worker(schema: Dict[str, Dict]) -> None:
+    global _worker_validator
+    _worker_validator = MOD_VALIDATOR if schema is MOD_SCHEMA else SchemaValidator(schema)
+
+
+def _validate_in_worker(path: pathlib.Path, strict: bool) -> Dict:
+    return validate_file(path, _worker_validator, strict=strict)
+
+
+def validate_folder(folder: pathlib.Path = MODS_DIR, *,
+                    validator: SchemaValidator = MOD_VALIDATOR,
+                    strict: bool = False,
+                    jobs: Optional[int] = None) -> List[Dict]:
+    """
+    Validate every mod file in *folder* (see :func:`find_mod_files`).
+
+    Results come back in file order, one per file; unreadable entries get a
+    diagnostic rather than aborting the pass.  Checking is CPU-bound, so it
+    runs in this process unless *jobs* > 1 asks for that many worker
+    processes (each compiles the schema once).  The calling script then
+    needs an ``if __name__ == "__main__":`` guard.
+    *strict* is passed on to :func:`validate_bytes`.
+    """
+    xml_files = find_mod_files(folder)
+    if not jobs or jobs < 2 or len(xml_files) < 2:
+        results = [validate_file(p, validator, strict=strict) for p in xml_files]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker,
+                initargs=(validator.schema,)) as pool:
+            results = list(pool.map(functools.partial(_validate_in_worker, strict=strict),
+                                    xml_files, chunksize=16))
+
+    for path, res in zip(xml_files, results):
+        res["file"] = path.relative_to(folder).as_posix()
+    return results
@@ -97,15 +97,88 @@ def _parse_engine(root: ET.Element) -> Optional[Dict]:
     return engine
 
 
+# --------------------------------------------------------------------------- #
+#  Helper: Turn a parsed <mod> tree into a mod dict
+# --------------------------------------------------------------------------- #
+
+def _parse_mod_tree(root: ET.Element, filename: str) -> Dict:
+    """
+    Build the mod dict for an already parsed <mod> *root*.
+
+    *filename* is only used for log messages.
+    """
+    mod_dict: Dict = {}
+
+    # Basic identification (required)
+    mod_dict["modId"] = _elem_text(root, "modInfo/modId", required=True)
+    mod_dict["name"]   = _elem_text(root, "modInfo/name", required=True)
+    mod_dict["author"] = _elem_text(root, "modInfo/author")
+    mod_dict["version"]= _elem_text(root, "modInfo/version")
+    mod_dict["description"] = _elem_text(root, "modInfo/description")
+    mod_dict["license"] = _elem_text(root, "modInfo/license")
+    mod_dict["modPage"] = _elem_text(root, "modInfo/modPage")
+
+    # Compatibility (optional)
+    comp_root = root.find("compatibility")
+    if comp_root is not None:
+        mod_dict["compatibility"] = {
+            "minEngine": _elem_text(comp_root, "minEngine"),
+            "maxEngine": _elem_text(comp_root, "maxEngine"),
+            "dependencies": [dep.text for dep in comp_root.findall("dependencies/dependency") if dep.text],
+        }
+
+    # Assets (optional)
+    assets_root = root.find("assets")
+    if assets_root is not None:
+        mod_dict["assets"] = {
+            "icon": _elem_text(assets_root, "icon"),
+            "textures": [tex.text for tex in assets_root.findall("textures/texture") if tex.text],
+            "sounds": [snd.text for snd in assets_root.findall("sounds/sound") if snd.text],
+        }
+
+    # Engine
+    engine = _parse_engine(root)
+    if engine is not None:
+        mod_dict["engine"] = engine
+
+    # Vehicle (optional)
+    vehicle_root = root.find("vehicle")
+    if vehicle_root is not None:
+        mod_dict["vehicle"] = {
+            "weightMultiplier": _elem_text(vehicle_root, "weightMultiplier"),
+            "soundPitch": _elem_text(vehicle_root, "soundPitch"),
+        }
+
+    # Mod Options
+    opt_root = root.find("modOptions")
+    if opt_root is not None:
+        mod_dict["modOptions"] = {
+            "enableUI": _elem_text(opt_root, "enableUI"),
+            "uiTheme": _elem_text(opt_root, "uiTheme"),
+            "keyBindings": _elem_text(opt_root, "keyBindings"),
+            "localization": _elem_text(opt_root, "localization"),
+        }
+
+    # Custom data – just drop the raw XML subtree for flexibility
+    custom_root = root.find("customData")
+    if custom_root is not None:
+        mod_dict["customData"] = ET.tostring(custom_root, encoding="unicode")
+
+    logging.debug("Parsed mod %s from %s", mod_dict["modId"], filename)
+    return mod_dict
+
+
 # --------------------------------------------------------------------------- #
 #  Main loader function
 # --------------------------------------------------------------------------- #
 
-def load_mods_from_folder(folder: pathlib.Path = MODS_DIR) -> List[Dict]:
+def load_mods_from_folder(folder: pathlib.Path = MODS_DIR, *, strict: bool = False) -> List[Dict]:
     """
     Scan *folder* for *.xml files, parse them and return a list of mod dicts.
 
     Skips files that cannot be parsed or that are missing a <mod> root tag.
+    With *strict*, every file is checked against :data:`modschema.MOD_SCHEMA`
+    and mods with any schema error are rejected as well.
     """
     mods: List[Dict] = []
 
@@ -113,6 +186,19 @@ def load_mods_from_folder(folder: pathlib.Path = MODS_DIR) -> List[Dict]:
         logging.error("Mods folder %s does not exist.", folder)
         return mods
 
+    if strict:
+        from modschema import validate_folder   # imports this module
+
+        for res in validate_folder(folder, strict=True):
+            for diag in res["diagnostics"]:
+                logging.error("%s:%d: <%s> %s", res["file"], diag["line"], diag["path"], diag["message"])
+            if res["valid"]:
+                mods.append(res["mod"])
+            else:
+                logging.error("Rejected %s (%d schema error(s)).", res["file"], len(res["diagnostics"]))
+        logging.info("Loaded %d mod(s) from %s (strict).", len(mods), folder)
+        return mods
+
     xml_files = sorted(folder.rglob("*.xml"))
     if not xml_files:
         logging.info("No XML mod files found in %s.", folder)
@@ -130,67 +216,7 @@ def load_mods_from_folder(folder: pathlib.Path = MODS_DIR) -> List[Dict]:
             logging.warning("File %s does not contain <mod> root; skipping.", xml_file.name)
             continue
 
-        # ------------------------------------------------------------------- #
-        #  Parse each logical block
-        # ------------------------------------------------------------------- #
-        mod_dict: Dict = {}
-
-        # Basic identification (required)
-        mod_dict["modId"] = _elem_text(root, "modInfo/modId", required=True)
-        mod_dict["name"]   = _elem_text(root, "modInfo/name", required=True)
-        mod_dict["author"] = _elem_text(root, "modInfo/author")
-        mod_dict["version"]= _elem_text(root, "modInfo/version")
-        mod_dict["description"] = _elem_text(root, "modInfo/description")
-        mod_dict["license"] = _elem_text(root, "modInfo/license")
-        mod_dict["modPage"] = _elem_text(root, "modInfo/modPage")
-
-        # Compatibility (optional)
-        comp_root = root.find("compatibility")
-        if comp_root is not None:
-            mod_dict["compatibility"] = {
-                "minEngine": _elem_text(comp_root, "minEngine"),
-                "maxEngine": _elem_text(comp_root, "maxEngine"),
-                "dependencies": [dep.text for dep in comp_root.findall("dependencies/dependency") if dep.text],
-            }
-
-        # Assets (optional)
-        assets_root = root.find("assets")
-        if assets_root is not None:
-            mod_dict["assets"] = {
-                "icon": _elem_text(assets_root, "icon"),
-                "textures": [tex.text for tex in assets_root.findall("textures/texture") if tex.text],
-                "sounds": [snd.text for snd in assets_root.findall("sounds/sound") if snd.text],
-            }
-
-        # Engine
-        engine = _parse_engine(root)
-        if engine is not None:
-            mod_dict["engine"] = engine
-
-        # Vehicle (optional)
-        vehicle_root = root.find("vehicle")
-        if vehicle_root is not None:
-            mod_dict["vehicle"] = {
-                "weightMultiplier": _elem_text(vehicle_root, "weightMultiplier"),
-                "soundPitch": _elem_text(vehicle_root, "soundPitch"),
-            }
-
-        # Mod Options
-        opt_root = root.find("modOptions")
-        if opt_root is not None:
-            mod_dict["modOptions"] = {
-                "enableUI": _elem_text(opt_root, "enableUI"),
-                "uiTheme": _elem_text(opt_root, "uiTheme"),
-                "keyBindings": _elem_text(opt_root, "keyBindings"),
-                "localization": _elem_text(opt_root, "localization"),
-            }
-
-        # Custom data – just drop the raw XML subtree for flexibility
-        custom_root = root.find("customData")
-        if custom_root is not None:
-            mod_dict["customData"] = ET.tostring(custom_root, encoding="unicode")
-
-        mods.append(mod_dict)
+        mods.append(_parse_mod_tree(root, xml_file.name))
 
     logging.info("Loaded %d mod(s) from %s.", len(mods), folder)
     return mods
@@ -225,7 +251,7 @@ def load_mods_from_files(file_list: List[str], folder: pathlib.Path = MODS_DIR)
             logging.warning("File %s does not contain <mod> root; skipping.", fn)
             continue
 
-        mods.append(_parse_mod_tree(root, xml_file.name)) # type: ignore
+        mods.append(_parse_mod_tree(root, xml_file.name))
 
     logging.info("Loaded %d mod(s) from file list.", len(mods))
     return mods
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+overlay.py
+~~~~~~~~~~
+
+Composes the ``engine`` and ``vehicle`` blocks of every active mod into the
+values that actually apply to the vehicle.
+
+Mods are applied in dependency order (a mod always comes after the mods it
+depends on).  Absolute values such as ``hp`` are taken from the last mod that
+sets them, multipliers such as ``weightMultiplier`` are multiplied together.
+Toggling a mod only recomputes the fields that mod (or a mod whose position in
+the load order moved) touches.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import struct
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# --------------------------------------------------------------------------- #
+#  Field definitions
+# --------------------------------------------------------------------------- #
+
+# field -> (section in the mod dict, composition rule)
+#   "set" – last mod in load order wins, differing values are a conflict
+#   "mul" – values are multiplied together, starting from 1.0
+FIELDS: Dict[str, Tuple[str, str]] = {
+    "hp": ("engine", "set"),
+    "torque": ("engine", "set"),
+    "weight": ("engine", "set"),
+    "fuelEfficiency": ("engine", "set"),
+    "turboBoost": ("engine", "set"),
+    "weightMultiplier": ("vehicle", "mul"),
+    "soundPitch": ("vehicle", "mul"),
+}
+
+# struct format codes that need an int instead of a float
+_INT_FORMATS = set("bBhHiIlLqQnN")
+
+
+def _field_values(mod: Dict) -> Dict[str, float]:
+    """Return the numeric overlay fields a single mod sets."""
+    values: Dict[str, float] = {}
+    for field, (section, _rule) in FIELDS.items():
+        block = mod.get(section) or {}
+        raw = block.get(field)
+        if raw is None:
+            continue
+        try:
+            value = float(raw)
+            if not math.isfinite(value):
+                raise ValueError(raw)
+            values[field] = value
+        except (TypeError, ValueError):
+            logging.warning("Ignoring invalid <%s> in mod %s: %s", field, mod.get("modId"), raw)
+    return values
+
+
+# --------------------------------------------------------------------------- #
+#  Overlay engine
+# --------------------------------------------------------------------------- #
+
+class OverlayEngine:
+    """
+    Keeps track of which mods are active and what the resulting vehicle
+    parameters are.
+
+    >>> ov = OverlayEngine(load_mods_from_folder())
+    >>> ov.effective["hp"]
+    350.0
+    >>> changed = ov.deactivate("superEngineMod")   # only its fields recomputed
+    """
+
+    def __init__(self, mods: Optional[Iterable[Dict]] = None, *, active: bool = True):
+        self._mods: Dict[str, Dict] = {}            # modId -> mod dict
+        self._values: Dict[str, Dict[str, float]] = {}  # modId -> overlay fields
+        self._touches: Dict[str, Set[str]] = {f: set() for f in FIELDS}
+        self._active: Set[str] = set()
+        self._order: List[str] = []
+        self._effective: Dict[str, Optional[float]] = {}
+        self._conflicts: Dict[str, Dict] = {}
+        self._written: Dict[str, Optional[float]] = {}
+        self._originals: Dict[str, float] = {}      # pre-mod value read by apply()
+        self.missing_dependencies: Dict[str, List[str]] = {}
+        self.cycles: List[str] = []                 # mods that are part of a cycle
+        self.unresolved: List[str] = []             # mods only blocked by a cycle
+        self.duplicates: Dict[str, int] = {}        # modId -> extra definitions ignored
+
+        # Register everything first and compute the result once
+        for mod in mods or []:
+            self._register(mod, active=active, replace=False)
+        self._refresh(set(FIELDS))
+
+    # ----------------------------------------------------------------
+    def add_mod(self, mod: Dict, *, active: bool = True, replace: bool = False) -> Set[str]:
+        """
+        Register a mod dict (as returned by modstuff) and optionally activate it.
+
+        A second mod with an id that is already registered is ignored and
+        counted in ``duplicates`` unless *replace* is given (or it is the
+        very same dict being re-added).
+        """
+        dirty = self._register(mod, active=active, replace=replace)
+        if dirty is None:
+            return set()
+        return self._refresh(dirty)
+
+    def activate(self, mod_id: str) -> Set[str]:
+        """Activate *mod_id*; returns the fields whose effective value changed."""
+        if mod_id not in self._mods:
+            raise KeyError(f"No mod named '{mod_id}' in overlay")
+        if mod_id in self._active:
+            return set()
+        self._active.add(mod_id)
+        return self._refresh(set(self._values[mod_id]))
+
+    def deactivate(self, mod_id: str) -> Set[str]:
+        """Deactivate *mod_id*; returns the fields whose effective value changed."""
+        if mod_id not in self._mods:
+            raise KeyError(f"No mod named '{mod_id}' in overlay")
+        if mod_id not in self._active:
+            return set()
+        self._active.discard(mod_id)
+        return self._refresh(set(self._values[mod_id]))
+
+    def toggle(self, mod_id: str) -> Set[str]:
+        """Flip *mod_id* between active and inactive."""
+        if mod_id in self._active:
+            return self.deactivate(mod_id)
+        return self.activate(mod_id)
+
+    # ----------------------------------------------------------------
+    @property
+    def load_order(self) -> List[str]:
+        """Active mod ids in the order they are applied."""
+        return list(self._order)
+
+    @property
+    def effective(self) -> Dict[str, float]:
+        """Final value of every field at least one active mod sets."""
+        return {f: self._effective[f] for f in FIELDS if self._effective.get(f) is not None}
+
+    @property
+    def conflicts(self) -> List[Dict]:
+        """
+        One dict per "set" field that several active mods give different values:
+        ``{"field", "mods", "values", "winner"}``.
+        """
+        return [self._conflicts[f] for f in FIELDS if f in self._conflicts]
+
+    # ----------------------------------------------------------------
+    def pending_writes(self, pointer_map: Dict[str, Tuple]) -> List[Tuple[str, float, str]]:
+        """
+        Return ``(pointer_name, value, fmt)`` for every mapped field whose
+        effective value changed since the last :meth:`mark_written`.
+
+        *pointer_map* maps an overlay field to a pointer name from config.yaml,
+        a struct format and optionally the unmodded value, e.g.
+        ``{"hp": ("engine_hp", "f", 180.0)}``.  Each tuple can be passed
+        straight to ``MemoryEditor.set_value(*write)``.
+
+        When no active mod sets a field any more, the unmodded value is
+        written back – either the default from *pointer_map* or the value
+        :meth:`apply` saw before its first write.
+        """
+        return [write[1:] for write in self._pending(pointer_map)]
+
+    def _pending(self, pointer_map: Dict[str, Tuple]) -> List[Tuple[str, str, float, str]]:
+        """:meth:`pending_writes`, with the overlay field in front of each write."""
+        batch: List[Tuple[str, str, float, str]] = []
+        for field, spec in pointer_map.items():
+            pointer, fmt = spec[0], spec[1]
+            value = self._effective.get(field)
+            written = self._written.get(field)
+            if value is None:
+                if written is None:
+                    continue
+                value = spec[2] if len(spec) > 2 else self._originals.get(field)
+                if value is None:
+                    logging.warning("No unmodded value known for %s; leaving %s in place.", field, written)
+                    continue
+            elif written == value:
+                continue
+            if fmt.lstrip("@=<>!")[-1:] in _INT_FORMATS:
+                value = int(round(value))
+            batch.append((field, pointer, value, fmt))
+        return batch
+
+    def mark_written(self, pointer_map: Dict[str, Tuple]) -> None:
+        """Record the current effective values of *pointer_map* as applied."""
+        for field in pointer_map:
+            self._written[field] = self._effective.get(field)
+
+    def apply(self, mem, pointer_map: Dict[str, Tuple]) -> int:
+        """
+        Write every pending value in one ``mem.transaction()`` and return how
+        many WriteProcessMemory calls were issued.  If any write fails the
+        game is restored and nothing is marked as written.
+
+        The first time a field is modded its previous value is taken from the
+        transaction's snapshot (unless *pointer_map* gives a default) so it
+        can be restored later.
+        """
+        batch = self._pending(pointer_map)
+        if not batch:
+            return 0
+
+        remember = {}   # field -> (address, fmt) whose original we still need
+        with mem.transaction() as tx:
+            for field, pointer, value, fmt in batch:
+                address = tx.set_value(pointer, value, fmt=fmt)
+                if (len(pointer_map[field]) < 3 and field not in self._originals
+                        and self._written.get(field) is None):
+                    remember[field] = (address, fmt)
+
+        for field, (address, fmt) in remember.items():
+            old = tx.original_bytes(address, struct.calcsize(fmt))
+            self._originals[field] = struct.unpack(fmt, old)[0]
+        self.mark_written(pointer_map)
+        return tx.writes_issued
+
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+    def _register(self, mod: Dict, *, active: bool, replace: bool) -> Optional[Set[str]]:
+        """Store *mod* without recomputing; returns the dirty fields or None."""
+        mod_id = mod.get("modId")
+        if not mod_id:
+            logging.warning("Cannot add a mod without a modId to the overlay.")
+            return None
+
+        dirty: Set[str] = set()
+        if mod_id in self._mods:
+            if not replace and mod is not self._mods[mod_id]:
+                self.duplicates[mod_id] = self.duplicates.get(mod_id, 0) + 1
+                logging.warning("Duplicate modId %s; keeping the first definition.", mod_id)
+                return None
+            # Re-adding replaces the old definition – drop its contributions first
+            dirty.update(self._values[mod_id])
+            for field in self._values[mod_id]:
+                self._touches[field].discard(mod_id)
+
+        self._mods[mod_id] = mod
+        self._values[mod_id] = _field_values(mod)
+        for field in self._values[mod_id]:
+            self._touches[field].add(mod_id)
+
+        if active:
+            self._active.add(mod_id)
+        return dirty | set(self._values[mod_id])
+
+    def _compute_order(self) -> List[str]:
+        """
+        Topologically sort the active mods by their dependencies.
+
+        Ties are broken by the order the mods were added, so the result is
+        stable.  Dependencies that are not active are recorded in
+        ``missing_dependencies``.  Mods that cannot be placed are appended
+        last: members of a cycle go to ``cycles``, mods that merely depend
+        on one go to ``unresolved``.
+        """
+        rank = {mod_id: i for i, mod_id in enumerate(self._mods)}
+        active = sorted(self._active, key=rank.__getitem__)
+        deps: Dict[str, Set[str]] = {}
+        self.missing_dependencies = {}
+
+        for mod_id in active:
+            wanted = (self._mods[mod_id].get("compatibility") or {}).get("dependencies") or []
+            deps[mod_id] = {d for d in wanted if d in self._active and d != mod_id}
+            missing = [d for d in wanted if d not in self._active]
+            if missing:
+                self.missing_dependencies[mod_id] = missing
+
+        dependants: Dict[str, List[str]] = {m: [] for m in active}
+        for mod_id, wanted in deps.items():
+            for dep in wanted:
+                dependants[dep].append(mod_id)
+        waiting = {m: len(deps[m]) for m in active}
+        ready = [rank[m] for m in active if not waiting[m]]
+        heapq.heapify(ready)
+        ids = list(self._mods)
+
+        order: List[str] = []
+        while ready:
+            mod_id = ids[heapq.heappop(ready)]
+            order.append(mod_id)
+            for child in dependants[mod_id]:
+                waiting[child] -= 1
+                if not waiting[child]:
+                    heapq.heappush(ready, rank[child])
+
+        stuck = [m for m in active if waiting[m]]
+        cycles = [m for m in stuck if self._in_cycle(m, deps)]
+        unresolved = [m for m in stuck if m not in cycles]
+        # Only log when the situation changes, not on every toggle
+        if cycles and cycles != self.cycles:
+            logging.warning("Dependency cycle between mods: %s", ", ".join(cycles))
+        if unresolved and unresolved != self.unresolved:
+            logging.warning("Mods blocked by a dependency cycle: %s", ", ".join(unresolved))
+        self.cycles, self.unresolved = cycles, unresolved
+        order.extend(stuck)
+        return order
+
+    @staticmethod
+    def _in_cycle(mod_id: str, deps: Dict[str, Set[str]]) -> bool:
+        """True if *mod_id* can reach itself through its dependencies."""
+        seen: Set[str] = set()
+        stack = list(deps[mod_id])
+        while stack:
+            current = stack.pop()
+            if current == mod_id:
+                return True
+            if current not in seen:
+                seen.add(current)
+                stack.extend(deps[current])
+        return False
+
+    def _refresh(self, dirty: Set[str]) -> Set[str]:
+        """Recompute the load order and the *dirty* fields; return changed fields."""
+        old_order = self._order
+        self._order = self._compute_order()
+
+        # Mods that kept their place relative to each other contribute in the
+        # same sequence as before, so only fields of mods that moved are dirty.
+        old_set = set(old_order)
+        old_rel = [m for m in old_order if m in self._active]
+        new_rel = [m for m in self._order if m in old_set]
+        if old_rel != new_rel:
+            for old, new in zip(old_rel, new_rel):
+                if old != new:
+                    dirty.update(self._values[old])
+                    dirty.update(self._values[new])
+
+        changed: Set[str] = set()
+        for field in dirty:
+            before = self._effective.get(field)
+            self._compute_field(field)
+            if self._effective.get(field) != before:
+                changed.add(field)
+        return changed
+
+    def _compute_field(self, field: str) -> None:
+        rule = FIELDS[field][1]
+        touching = self._touches[field]
+        contributors = [m for m in self._order if m in touching]
+        self._conflicts.pop(field, None)
+
+        if not contributors:
+            self._effective[field] = None
+            return
+
+        values = [self._values[m][field] for m in contributors]
+        if rule == "mul":
+            result = 1.0
+            for v in values:
+                result *= v
+            self._effective[field] = result
+            return
+
+        self._effective[field] = values[-1]
+        if len(set(values)) > 1:
+            self._conflicts[field] = {
+                "field": field,
+                "mods": contributors,
+                "values": values,
+                "winner": contributors[-1],
+            }